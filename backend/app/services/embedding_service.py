@@ -76,42 +76,65 @@ class EmbeddingService:
     ) -> List[List[float]]:
         """
         Generate embeddings for multiple texts in batches.
-        
+
+        Each batch goes to Gemini as a single embed_content call, so the
+        HTTP round-trip and rate-limit wait are paid once per batch_size
+        texts instead of once per text.
+
         Args:
             texts: List of texts to embed
-            batch_size: Number of texts to process at once
-            
+            batch_size: Number of texts to send per API call
+
         Returns:
             List[List[float]]: List of embedding vectors
-            
+
         Raises:
             Exception: If any embedding generation fails
         """
         if not texts:
             return []
-        
+
         embeddings = []
         failed_indices = []
-        
+
         for i in range(0, len(texts), batch_size):
             batch = texts[i:i + batch_size]
-            batch_embeddings = []
-            
+
+            try:
+                self._rate_limit()
+
+                # embed_content accepts a list of contents and returns a
+                # list of vectors under the same 'embedding' key
+                result = genai.embed_content(
+                    model=self.model_name,
+                    content=batch,
+                    task_type="retrieval_document",
+                    title="Document chunk"
+                )
+
+                if not result or 'embedding' not in result:
+                    raise Exception("Invalid response from Gemini API")
+
+                embeddings.extend(result['embedding'])
+                continue
+
+            except Exception:
+                pass
+
+            # Fall back to one call per text so a single bad input doesn't
+            # void the whole batch
             for j, text in enumerate(batch):
                 try:
-                    embedding = self.generate_embedding(text)
-                    batch_embeddings.append(embedding)
+                    embeddings.append(self.generate_embedding(text))
                 except Exception as e:
                     print(f"Failed to embed text at index {i + j}: {str(e)}")
                     failed_indices.append(i + j)
                     # Use zero vector as fallback
-                    batch_embeddings.append([0.0] * 768)  # Assuming 768-dim embeddings
-            
-            embeddings.extend(batch_embeddings)
-        
+                    embeddings.append([0.0] * 768)  # Assuming 768-dim embeddings
+
         if failed_indices:
             print(f"Warning: Failed to generate embeddings for {len(failed_indices)} texts")
-        
+
         return embeddings
     
     def generate_query_embedding(self, query: str) -> List[float]:
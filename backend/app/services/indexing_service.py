@@ -18,18 +18,25 @@ from app.services.document_processor import DocumentService
 class IndexingService:
     """Service that orchestrates document processing, embedding, and indexing."""
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        embedding_service: Optional[EmbeddingService] = None,
+        vector_store: Optional[VectorStore] = None
+    ):
         """
         Initialize the indexing service.
-        
+
         Args:
             db: Database session
+            embedding_service: Shared embedding service (created if not given)
+            vector_store: Shared vector store client (created if not given)
         """
         self.db = db
         self.document_service = DocumentService(db)
         self.text_processor = DocumentProcessor()
-        self.embedding_service = EmbeddingService()
-        self.vector_store = VectorStore()
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.vector_store = vector_store or VectorStore()
     
     def process_document(self, document_id: int) -> bool:
         """
@@ -81,7 +88,107 @@ class IndexingService:
             # Handle processing failure
             self._handle_processing_error(document_id, str(e))
             return False
-    
+
+    def process_documents_bulk(self, document_ids: List[int]) -> Dict[int, bool]:
+        """
+        Process several documents, embedding all their chunks in one pass.
+
+        Extraction and chunking run per document, but every chunk text is
+        sent to the embedding service together, so the batch pays for one
+        embedding pass instead of one per document.
+
+        Args:
+            document_ids: IDs of documents to process
+
+        Returns:
+            Dict[int, bool]: Success flag per document ID
+        """
+        results = {document_id: False for document_id in document_ids}
+
+        # Step 1: Extract and chunk every document
+        extracted = []
+        for document_id in document_ids:
+            document = self.document_service.get_document(document_id)
+            if not document:
+                continue
+
+            self._update_document_status(
+                document_id,
+                DocumentStatus.PROCESSING,
+                ProcessingStage.EXTRACTION
+            )
+
+            try:
+                chunks_data, doc_metadata = self._extract_and_chunk(document)
+                extracted.append((document_id, chunks_data, doc_metadata))
+            except Exception as e:
+                self._handle_processing_error(document_id, str(e))
+
+        if not extracted:
+            return results
+
+        # Step 2: Embed all chunks from all documents together
+        texts = [
+            chunk['content']
+            for _, chunks_data, _ in extracted
+            for chunk in chunks_data
+        ]
+        try:
+            all_embeddings = self.embedding_service.generate_embeddings_batch(
+                texts,
+                batch_size=5  # Smaller batch for rate limiting
+            )
+        except Exception as e:
+            for document_id, _, _ in extracted:
+                self._handle_processing_error(
+                    document_id, f"Embedding generation failed: {str(e)}"
+                )
+            return results
+
+        # Step 3: Store every chunk in ChromaDB with a single add call —
+        # one index write per batch instead of one per document
+        all_texts = []
+        all_metadatas = []
+        for document_id, chunks_data, _ in extracted:
+            all_texts.extend(chunk['content'] for chunk in chunks_data)
+            all_metadatas.extend(self._build_chunk_metadatas(document_id, chunks_data))
+
+        try:
+            all_vector_ids = self.vector_store.add_documents(
+                texts=all_texts,
+                embeddings=all_embeddings,
+                metadatas=all_metadatas
+            )
+        except Exception as e:
+            for document_id, _, _ in extracted:
+                self._handle_processing_error(
+                    document_id, f"Vector storage failed: {str(e)}"
+                )
+            return results
+
+        # Step 4: Fan the vectors back out and finish each document
+        offset = 0
+        for document_id, chunks_data, doc_metadata in extracted:
+            embeddings = all_embeddings[offset:offset + len(chunks_data)]
+            vector_ids = all_vector_ids[offset:offset + len(chunks_data)]
+            offset += len(chunks_data)
+
+            try:
+                self._save_chunks_to_db(document_id, chunks_data, embeddings, vector_ids)
+                self._finalize_document(document_id, doc_metadata)
+
+                self._log_processing_step(
+                    document_id,
+                    ProcessingStage.COMPLETE,
+                    "success",
+                    f"Successfully processed document with {len(chunks_data)} chunks"
+                )
+                results[document_id] = True
+            except Exception as e:
+                self._handle_processing_error(document_id, str(e))
+
+        return results
+
     def _extract_and_chunk(self, document: Document) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Extract text and chunk the document.
@@ -187,6 +294,52 @@ class IndexingService:
             )
             raise Exception(f"Embedding generation failed: {str(e)}")
     
+    def _build_chunk_metadatas(
+        self,
+        document_id: int,
+        chunks_data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Build per-chunk ChromaDB metadata for a document's chunks.
+
+        Args:
+            document_id: Document ID
+            chunks_data: List of chunk data
+
+        Returns:
+            List[Dict[str, Any]]: Metadata dictionary per chunk
+        """
+        # Get document info for consistent metadata
+        document = self.document_service.get_document(document_id)
+
+        # Fields shared by every chunk are built once and layered under the
+        # per-chunk values instead of being recomputed per dict
+        base_meta = {
+            'document_id': document_id,
+            'file_name': document.original_filename if document else "unknown",
+            'file_type': document.file_type if document else "unknown"
+        }
+
+        metadatas = []
+        for chunk in chunks_data:
+            meta = {
+                **base_meta,
+                'chunk_index': chunk['chunk_index'],
+                'character_count': chunk['character_count'],
+                'word_count': chunk['word_count'],
+                'start_page': chunk.get('start_page'),
+                'end_page': chunk.get('end_page')
+            }
+            # Chunk-level metadata wins when the loader provided it
+            file_name = chunk['metadata'].get('file_name')
+            if file_name:
+                meta['file_name'] = file_name
+            file_type = chunk['metadata'].get('file_type')
+            if file_type:
+                meta['file_type'] = file_type
+            metadatas.append(meta)
+        return metadatas
+
     def _store_in_vector_db(
         self, 
         document_id: int, 
@@ -216,26 +369,8 @@ class IndexingService:
             
             # Prepare data for ChromaDB
             texts = [chunk['content'] for chunk in chunks_data]
-            metadatas = []
-            
-            # Get document info for consistent metadata
-            document = self.document_service.get_document(document_id)
-            doc_file_name = document.original_filename if document else "unknown"
-            doc_file_type = document.file_type if document else "unknown"
-            
-            for i, chunk in enumerate(chunks_data):
-                metadata = {
-                    'document_id': document_id,
-                    'chunk_index': chunk['chunk_index'],
-                    'character_count': chunk['character_count'],
-                    'word_count': chunk['word_count'],
-                    'start_page': chunk.get('start_page'),
-                    'end_page': chunk.get('end_page'),
-                    'file_name': chunk['metadata'].get('file_name') or doc_file_name,
-                    'file_type': chunk['metadata'].get('file_type') or doc_file_type
-                }
-                metadatas.append(metadata)
-            
+            metadatas = self._build_chunk_metadatas(document_id, chunks_data)
+
             # Store in ChromaDB
             vector_ids = self.vector_store.add_documents(
                 texts=texts,
@@ -2,6 +2,7 @@
 RAG search service using LangChain for query processing and response generation.
 """
 
+import asyncio
 from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 from langchain.schema import Document as LangChainDocument
@@ -19,16 +20,25 @@ from app.config.settings import settings
 class RAGSearchService:
     """RAG search service using LangChain for query processing."""
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        embedding_service: Optional[EmbeddingService] = None,
+        vector_store: Optional[VectorStore] = None
+    ):
         """
         Initialize the RAG search service.
-        
+
         Args:
             db: Database session
+            embedding_service: Optional shared embedding service; a new one
+                is created when omitted
+            vector_store: Optional shared vector store; a new one is
+                created when omitted
         """
         self.db = db
-        self.embedding_service = EmbeddingService()
-        self.vector_store = VectorStore()
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.vector_store = vector_store or VectorStore()
         self.document_service = DocumentService(db)
         
         # Initialize LLM
@@ -136,7 +146,83 @@ Think like a pair programming partner who's really good at finding solutions in
             
         except Exception as e:
             raise Exception(f"RAG search failed: {str(e)}")
-    
+
+    async def asearch(
+        self,
+        query: str,
+        k: int = 5,
+        document_ids: Optional[List[int]] = None,
+        file_types: Optional[List[str]] = None,
+        min_similarity: float = 0.0
+    ) -> Dict[str, Any]:
+        """
+        Async variant of search, for running several queries concurrently.
+
+        The embedding and vector store calls are synchronous clients, so they
+        run on worker threads; answer generation awaits the LLM's native
+        async client. With asyncio.gather the network round-trips of many
+        queries overlap instead of adding up.
+
+        Args:
+            query: User query/question
+            k: Number of chunks to retrieve
+            document_ids: Optional filter by specific document IDs
+            file_types: Optional filter by file types
+            min_similarity: Minimum similarity threshold
+
+        Returns:
+            Dict[str, Any]: Search results with answer and sources
+        """
+        try:
+            query_embedding = await asyncio.to_thread(
+                self.embedding_service.generate_query_embedding, query
+            )
+
+            where_filter = self._build_metadata_filter(document_ids, file_types)
+
+            search_results = await asyncio.to_thread(
+                self.vector_store.similarity_search,
+                query_embedding=query_embedding,
+                k=k,
+                where=where_filter,
+                min_similarity=min_similarity
+            )
+
+            if not search_results:
+                return {
+                    "answer": "I couldn't find any relevant information in the knowledge base to answer your question.",
+                    "sources": [],
+                    "query": query,
+                    "total_chunks": 0,
+                    "search_results": []
+                }
+
+            context = self._prepare_context(search_results)
+            answer = await self._agenerate_answer(query, context)
+
+            sources = self._prepare_sources(search_results)
+
+            return {
+                "answer": answer,
+                "sources": sources,
+                "query": query,
+                "total_chunks": len(search_results),
+                "search_results": [
+                    {
+                        "content": result["document"],
+                        "similarity_score": result["similarity_score"],
+                        "metadata": result["metadata"],
+                        "document_id": result["metadata"].get("document_id"),
+                        "chunk_index": result["metadata"].get("chunk_index"),
+                        "file_name": result["metadata"].get("file_name")
+                    }
+                    for result in search_results
+                ]
+            }
+
+        except Exception as e:
+            raise Exception(f"RAG search failed: {str(e)}")
+
     def similarity_search_only(
         self,
         query: str,
@@ -279,7 +365,33 @@ Think like a pair programming partner who's really good at finding solutions in
             
         except Exception as e:
             return f"I encountered an error while generating an answer: {str(e)}"
-    
+
+    async def _agenerate_answer(self, query: str, context: str) -> str:
+        """
+        Generate answer using the LLM's async client with retrieved context.
+
+        Args:
+            query: User query
+            context: Retrieved context
+
+        Returns:
+            str: Generated answer
+        """
+        try:
+            rag_chain = (
+                {"context": RunnablePassthrough(), "question": RunnablePassthrough()}
+                | self.rag_prompt
+                | self.llm
+                | StrOutputParser()
+            )
+
+            answer = await rag_chain.ainvoke({"context": context, "question": query})
+
+            return answer.strip()
+
+        except Exception as e:
+            return f"I encountered an error while generating an answer: {str(e)}"
+
     def _prepare_sources(self, search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Prepare source information from search results.
@@ -2,14 +2,53 @@
 Vector store service using ChromaDB for storing and retrieving embeddings.
 """
 
+import logging
 import uuid
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 
 from app.config.settings import settings
 
+logger = logging.getLogger(__name__)
+
+
+def _clean_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Clean metadata to ensure compatibility with ChromaDB.
+
+    Module-level function (no attribute lookups per call) so batched adds can
+    map it directly over large metadata lists.
+
+    Args:
+        metadata: Raw metadata dictionary
+
+    Returns:
+        Dict[str, Any]: Cleaned metadata dictionary
+    """
+    cleaned = {}
+    for key, value in metadata.items():
+        # Skip None values
+        if value is None:
+            continue
+
+        # Convert all values to strings to ensure compatibility
+        if isinstance(value, (str, int, float, bool)):
+            cleaned[str(key)] = str(value)
+        elif isinstance(value, dict):
+            # For nested dicts, convert to JSON string
+            cleaned[str(key)] = str(value)
+        elif isinstance(value, list):
+            # For lists, convert to comma-separated string
+            cleaned[str(key)] = ", ".join(str(item) for item in value if item is not None)
+        else:
+            # For other types, convert to string
+            cleaned[str(key)] = str(value)
+
+    return cleaned
+
 
 class VectorStore:
     """ChromaDB vector store for document embeddings."""
@@ -37,7 +76,7 @@ class VectorStore:
             self.collection = self.client.get_collection(
                 name=self.collection_name
             )
-            print(f"Loaded existing ChromaDB collection: {self.collection_name}")
+            logger.info("Loaded existing ChromaDB collection: %s", self.collection_name)
             
         except Exception:
             # Create new collection if it doesn't exist
@@ -45,73 +84,60 @@ class VectorStore:
                 name=self.collection_name,
                 metadata={"description": "Document chunks for RAG"}
             )
-            print(f"Created new ChromaDB collection: {self.collection_name}")
+            logger.info("Created new ChromaDB collection: %s", self.collection_name)
     
     def _clean_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
         Clean metadata to ensure compatibility with ChromaDB.
-        
+
         Args:
             metadata: Raw metadata dictionary
-            
+
         Returns:
             Dict[str, Any]: Cleaned metadata dictionary
         """
-        cleaned = {}
-        for key, value in metadata.items():
-            # Skip None values
-            if value is None:
-                continue
-            
-            # Convert all values to strings to ensure compatibility
-            if isinstance(value, (str, int, float, bool)):
-                cleaned[str(key)] = str(value)
-            elif isinstance(value, dict):
-                # For nested dicts, convert to JSON string
-                cleaned[str(key)] = str(value)
-            elif isinstance(value, list):
-                # For lists, convert to comma-separated string
-                cleaned[str(key)] = ", ".join(str(item) for item in value if item is not None)
-            else:
-                # For other types, convert to string
-                cleaned[str(key)] = str(value)
-        
-        return cleaned
+        return _clean_metadata(metadata)
 
     def add_documents(
         self,
         texts: List[str],
-        embeddings: List[List[float]],
+        embeddings: Union[np.ndarray, List[List[float]]],
         metadatas: List[Dict[str, Any]],
         ids: Optional[List[str]] = None
     ) -> List[str]:
         """
         Add documents to the vector store.
-        
+
         Args:
             texts: List of document texts
-            embeddings: List of embedding vectors
+            embeddings: Embedding vectors as an (N, D) array or list of lists
             metadatas: List of metadata dictionaries
             ids: Optional list of document IDs (will generate if not provided)
-            
+
         Returns:
             List[str]: Document IDs that were added
-            
+
         Raises:
             Exception: If adding documents fails
         """
-        if not texts or not embeddings or not metadatas:
+        if not texts or len(embeddings) == 0 or not metadatas:
             raise ValueError("texts, embeddings, and metadatas cannot be empty")
-        
-        if len(texts) != len(embeddings) or len(texts) != len(metadatas):
+
+        # Convert to a single float32 array once; ChromaDB accepts ndarrays
+        # directly, avoiding per-value Python float objects for large batches
+        if not isinstance(embeddings, np.ndarray):
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        if len(texts) != embeddings.shape[0] or len(texts) != len(metadatas):
             raise ValueError("texts, embeddings, and metadatas must have the same length")
         
         # Generate IDs if not provided
         if ids is None:
             ids = [str(uuid.uuid4()) for _ in texts]
         
-        # Clean metadatas to ensure ChromaDB compatibility
-        cleaned_metadatas = [self._clean_metadata(metadata) for metadata in metadatas]
+        # Clean metadatas to ensure ChromaDB compatibility; map over the
+        # module-level function to avoid per-item method dispatch
+        cleaned_metadatas = list(map(_clean_metadata, metadatas))
         
         try:
             # Add documents to ChromaDB
@@ -122,7 +148,7 @@ class VectorStore:
                 ids=ids
             )
             
-            print(f"Added {len(texts)} documents to ChromaDB")
+            logger.debug("Added %d documents to ChromaDB", len(texts))
             return ids
             
         except Exception as e:
@@ -158,27 +184,27 @@ class VectorStore:
             
             # Convert ChromaDB results to our format
             search_results = []
-            
+
             if results['documents'] and results['documents'][0]:
                 documents = results['documents'][0]
                 metadatas = results['metadatas'][0] if results['metadatas'] else []
                 distances = results['distances'][0] if results['distances'] else []
-                
-                for i, doc in enumerate(documents):
-                    # Convert distance to similarity score (ChromaDB uses L2 distance)
-                    distance = distances[i] if i < len(distances) else 1.0
-                    similarity = max(0.0, 1.0 - (distance / 2.0))  # Rough conversion
-                    
-                    # Filter by minimum similarity
-                    if similarity >= min_similarity:
-                        result = {
-                            'document': doc,
-                            'similarity_score': similarity,
-                            'distance': distance,
-                            'metadata': metadatas[i] if i < len(metadatas) else {}
-                        }
-                        search_results.append(result)
-            
+
+                # Convert distances to similarity scores in one vectorized pass
+                # (ChromaDB uses L2 distance; rough conversion to 0-1 similarity)
+                distances_arr = np.full(len(documents), 1.0, dtype=np.float32)
+                distances_arr[:len(distances)] = distances
+                similarities = np.clip(1.0 - distances_arr * 0.5, 0.0, None)
+
+                # Filter by minimum similarity and build results only for survivors
+                for i in np.nonzero(similarities >= min_similarity)[0]:
+                    search_results.append({
+                        'document': documents[i],
+                        'similarity_score': float(similarities[i]),
+                        'distance': float(distances_arr[i]),
+                        'metadata': metadatas[i] if i < len(metadatas) else {}
+                    })
+
             return search_results
             
         except Exception as e:
@@ -213,7 +239,7 @@ class VectorStore:
             return None
             
         except Exception as e:
-            print(f"Failed to get document {document_id}: {str(e)}")
+            logger.warning("Failed to get document %s: %s", document_id, e)
             return None
     
     def delete_documents(self, ids: List[str]) -> bool:
@@ -228,39 +254,39 @@ class VectorStore:
         """
         try:
             if not ids:
-                print("No IDs provided for deletion")
+                logger.debug("No IDs provided for deletion")
                 return True
-            
-            print(f"Attempting to delete {len(ids)} documents from ChromaDB: {ids}")
-            
-            # Check if documents exist before deletion
-            for doc_id in ids:
-                try:
-                    result = self.collection.get(ids=[doc_id])
-                    exists = result['documents'] and result['documents'][0]
-                    print(f"  Document {doc_id} exists before deletion: {bool(exists)}")
-                except Exception as e:
-                    print(f"  Error checking document {doc_id}: {e}")
-            
+
+            logger.debug("Attempting to delete %d documents from ChromaDB: %s", len(ids), ids)
+
+            # Check if documents exist before deletion (debug-only verification)
+            if logger.isEnabledFor(logging.DEBUG):
+                for doc_id in ids:
+                    try:
+                        result = self.collection.get(ids=[doc_id])
+                        exists = result['documents'] and result['documents'][0]
+                        logger.debug("  Document %s exists before deletion: %s", doc_id, bool(exists))
+                    except Exception as e:
+                        logger.debug("  Error checking document %s: %s", doc_id, e)
+
             # Perform deletion
             self.collection.delete(ids=ids)
-            print(f"ChromaDB delete operation completed for {len(ids)} documents")
-            
-            # Verify deletion
-            for doc_id in ids:
-                try:
-                    result = self.collection.get(ids=[doc_id])
-                    exists = result['documents'] and result['documents'][0]
-                    print(f"  Document {doc_id} exists after deletion: {bool(exists)}")
-                except Exception as e:
-                    print(f"  Error verifying deletion of {doc_id}: {e}")
-            
+            logger.debug("ChromaDB delete operation completed for %d documents", len(ids))
+
+            # Verify deletion (debug-only verification)
+            if logger.isEnabledFor(logging.DEBUG):
+                for doc_id in ids:
+                    try:
+                        result = self.collection.get(ids=[doc_id])
+                        exists = result['documents'] and result['documents'][0]
+                        logger.debug("  Document %s exists after deletion: %s", doc_id, bool(exists))
+                    except Exception as e:
+                        logger.debug("  Error verifying deletion of %s: %s", doc_id, e)
+
             return True
-            
+
         except Exception as e:
-            print(f"Failed to delete documents: {str(e)}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Failed to delete documents: %s", e)
             return False
     
     def delete_by_metadata(self, where: Dict[str, Any]) -> bool:
@@ -275,11 +301,11 @@ class VectorStore:
         """
         try:
             self.collection.delete(where=where)
-            print(f"Deleted documents matching filter: {where}")
+            logger.debug("Deleted documents matching filter: %s", where)
             return True
             
         except Exception as e:
-            print(f"Failed to delete documents by metadata: {str(e)}")
+            logger.warning("Failed to delete documents by metadata: %s", e)
             return False
     
     def count_documents(self) -> int:
@@ -292,7 +318,7 @@ class VectorStore:
         try:
             return self.collection.count()
         except Exception as e:
-            print(f"Failed to count documents: {str(e)}")
+            logger.warning("Failed to count documents: %s", e)
             return 0
     
     def get_collection_info(self) -> Dict[str, Any]:
@@ -320,11 +346,11 @@ class VectorStore:
             # Delete the collection and recreate it
             self.client.delete_collection(name=self.collection_name)
             self._initialize_collection()
-            print(f"Reset collection: {self.collection_name}")
+            logger.info("Reset collection: %s", self.collection_name)
             return True
             
         except Exception as e:
-            print(f"Failed to reset collection: {str(e)}")
+            logger.warning("Failed to reset collection: %s", e)
             return False
     
     def search_by_text(
@@ -356,16 +382,20 @@ class VectorStore:
         self,
         ids: Optional[List[str]] = None,
         limit: int = 10,
-        include_text: bool = True
+        include_text: bool = True,
+        as_numpy: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Get embeddings from the vector store.
-        
+
         Args:
             ids: Optional list of specific IDs to retrieve
             limit: Maximum number of embeddings to return (if ids not specified)
             include_text: Whether to include the document text
-            
+            as_numpy: Return each embedding as a float32 row view of one
+                shared matrix instead of a Python list; downstream numpy
+                analysis then skips a per-embedding conversion copy
+
         Returns:
             List[Dict[str, Any]]: List of embeddings with metadata
         """
@@ -382,24 +412,26 @@ class VectorStore:
                     limit=limit,
                     include=["embeddings", "documents", "metadatas"]
                 )
-            
+
             embeddings_data = []
-            
+
             # Check if we have embeddings and they contain data
             if results['embeddings'] is not None and len(results['embeddings']) > 0:
+                # One contiguous matrix: magnitudes come from a single
+                # vectorized pass rather than a Python loop per row
+                matrix = np.ascontiguousarray(results['embeddings'], dtype=np.float32)
+                magnitudes = np.linalg.norm(matrix, axis=1)
+
                 for i, embedding in enumerate(results['embeddings']):
                     embedding_id = results['ids'][i] if results['ids'] and i < len(results['ids']) else f"unknown_{i}"
                     document = results['documents'][i] if results['documents'] and i < len(results['documents']) else ""
                     metadata = results['metadatas'][i] if results['metadatas'] and i < len(results['metadatas']) else {}
-                    
-                    # Calculate embedding magnitude
-                    magnitude = sum(x * x for x in embedding) ** 0.5
-                    
+
                     embedding_data = {
                         'vector_id': embedding_id,
-                        'embedding': embedding,
-                        'dimension': len(embedding),
-                        'magnitude': magnitude,
+                        'embedding': matrix[i] if as_numpy else embedding,
+                        'dimension': matrix.shape[1],
+                        'magnitude': float(magnitudes[i]),
                         'metadata': metadata
                     }
                     
@@ -452,22 +484,19 @@ class VectorStore:
                     'sample_embedding_ids': []
                 }
             
-            embeddings = results['embeddings']
-            magnitudes = []
-            
-            for embedding in embeddings:
-                magnitude = sum(x * x for x in embedding) ** 0.5
-                magnitudes.append(magnitude)
-            
+            # Compute all per-row magnitudes in one contiguous array pass
+            # rather than a Python loop per embedding
+            arr = np.ascontiguousarray(results['embeddings'], dtype=np.float32)
+            magnitudes = np.linalg.norm(arr, axis=1)
+
             total_count = self.count_documents()
-            dimension = len(embeddings[0]) if len(embeddings) > 0 else 0
-            
+
             return {
                 'total_embeddings': total_count,
-                'embedding_dimension': dimension,
-                'average_magnitude': sum(magnitudes) / len(magnitudes),
-                'min_magnitude': min(magnitudes),
-                'max_magnitude': max(magnitudes),
+                'embedding_dimension': arr.shape[1],
+                'average_magnitude': float(magnitudes.mean()),
+                'min_magnitude': float(magnitudes.min()),
+                'max_magnitude': float(magnitudes.max()),
                 'sample_embedding_ids': results['ids'][:10]  # First 10 IDs as samples
             }
             
@@ -498,10 +527,12 @@ class VectorStore:
             embedding = results['embeddings'][0]
             document = results['documents'][0] if results['documents'] else ""
             metadata = results['metadatas'][0] if results['metadatas'] else {}
-            
-            # Calculate embedding statistics
-            magnitude = sum(x * x for x in embedding) ** 0.5
-            
+
+            # Calculate embedding statistics with vectorized reductions
+            # instead of five separate Python-level sweeps over the vector
+            arr = np.asarray(embedding, dtype=np.float32)
+            magnitude = float(np.linalg.norm(arr))
+
             return {
                 'vector_id': vector_id,
                 'embedding': embedding,
@@ -512,10 +543,10 @@ class VectorStore:
                 'metadata': metadata,
                 'embedding_stats': {
                     'magnitude': magnitude,
-                    'min_value': min(embedding),
-                    'max_value': max(embedding),
-                    'mean_value': sum(embedding) / len(embedding),
-                    'non_zero_count': sum(1 for x in embedding if x != 0.0)
+                    'min_value': float(arr.min()),
+                    'max_value': float(arr.max()),
+                    'mean_value': float(arr.mean()),
+                    'non_zero_count': int(np.count_nonzero(arr))
                 }
             }
             
@@ -0,0 +1,451 @@
+"""
+Shared machinery for the bulk document indexing scripts.
+
+Holds everything the NextJS and Kant indexers have in common: directory
+scanning, the mock upload file, concurrent batch uploads, the bulk
+embed-and-index pass, and summary reporting. Subclasses supply the file
+suffix, content type, and title/description generation, so optimizations
+to the hot path land in one place.
+"""
+
+import sys
+import os
+import re
+import time
+import asyncio
+import hashlib
+import importlib.util
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+# Prefer running as `python -m scripts.<name>` from backend/ so imports
+# resolve through the normal package machinery and its bytecode cache;
+# fall back to a path tweak for direct `python scripts/<name>.py` runs
+if importlib.util.find_spec("app") is None:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.database import get_db
+from app.services.document_processor import DocumentService
+from app.services.indexing_service import IndexingService
+from app.services.embedding_service import EmbeddingService
+from app.services.vector_store import VectorStore
+from app.models.database import Document
+
+
+# Matches the "01-" style ordering prefixes used in docs filenames
+_NUM_PREFIX = re.compile(r'^\d+-')
+
+
+def strip_num_prefix(s: str) -> str:
+    """Strip a leading "01-" style number prefix in one regex pass."""
+    return _NUM_PREFIX.sub('', s, count=1)
+
+
+def _fast_find(directory: str, suffix: str) -> List[str]:
+    """
+    Recursively collect files with the given suffix using raw os.scandir.
+
+    rglob builds a Path object for every directory entry it visits; this
+    walks an explicit stack of string paths and only matches are lifted to
+    Path by the caller.
+    """
+    stack = [directory]
+    out = []
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(suffix):
+                        out.append(entry.path)
+        except OSError:
+            continue
+    return out
+
+
+class MockUploadFile:
+    """Mock UploadFile for bulk processing existing files."""
+
+    def __init__(self, file_path: Path, content_type: str, content: bytes = None):
+        self.file_path = file_path
+        self.filename = file_path.name
+        self.content_type = content_type
+        self._content = content
+        self._sha256 = None
+
+    @property
+    def size(self) -> int:
+        """File size in bytes, without forcing a content read."""
+        if self._content is not None:
+            return len(self._content)
+        return os.path.getsize(self.file_path)
+
+    async def read(self) -> bytes:
+        """Read file content without blocking the event loop."""
+        if self._content is None:
+            self._content = await asyncio.to_thread(self.file_path.read_bytes)
+        return self._content
+
+    async def hash(self) -> bytes:
+        """SHA-256 digest of the content, computed once from the cached bytes."""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(await self.read()).digest()
+        return self._sha256
+
+    async def seek(self, offset: int):
+        """Seek to position (not used in our case)."""
+        pass
+
+
+class BulkIndexerBase:
+    """
+    Shared bulk document indexing pipeline.
+
+    Subclasses set ``suffix``, ``content_type``, ``file_label`` and
+    ``summary_title``, and implement ``title_for``/``description_for``.
+    """
+
+    suffix = ""
+    content_type = "application/octet-stream"
+    file_label = "files"
+    summary_title = "BULK INDEXING SUMMARY"
+
+    def __init__(self):
+        """Initialize the bulk indexer."""
+        self.stats = {
+            'total_files': 0,
+            'processed': 0,
+            'skipped': 0,
+            'failed': 0,
+            'start_time': None,
+            'end_time': None
+        }
+        # Content digests seen this run, for hash-based duplicate skipping
+        self._seen_hashes = set()
+
+    def title_for(self, file_path: Path) -> str:
+        """Generate the display title for a file."""
+        raise NotImplementedError
+
+    def description_for(self, title: str) -> str:
+        """Generate the document description for a title."""
+        raise NotImplementedError
+
+    def find_files(self, directory: str) -> List[Path]:
+        """
+        Find all matching files in the given directory recursively.
+
+        Args:
+            directory: Directory to search
+
+        Returns:
+            List[Path]: List of matching file paths
+        """
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Directory not found: {directory}")
+
+        files = [Path(p) for p in _fast_find(directory, self.suffix)]
+        print(f"Found {len(files)} {self.file_label} in {directory}")
+        return files
+
+    def _load_existing_filenames(self) -> set:
+        """
+        Load the original filenames of all indexed documents in one query.
+
+        Returns:
+            set: Original filenames already present in the database
+        """
+        db = next(get_db())
+        try:
+            return {name for (name,) in db.query(Document.original_filename).all()}
+        finally:
+            db.close()
+
+    def _pending_update(self, file_path: Path, document: Document) -> Optional[Dict[str, Any]]:
+        """
+        Build the deferred title/description update for a document.
+
+        Args:
+            file_path: Source file the document came from
+            document: Created document
+
+        Returns:
+            Optional[Dict[str, Any]]: Update mapping, or None when no title
+            could be generated
+        """
+        try:
+            title = self.title_for(file_path)
+        except Exception as e:
+            print(f"    Warning: Could not generate title for {file_path.name}: {e}")
+            return None
+
+        return {
+            'id': document.id,
+            'title': title,
+            'description': self.description_for(title),
+        }
+
+    async def upload_document(
+        self,
+        file_path: Path,
+        document_service: DocumentService,
+        content: bytes = None
+    ) -> Tuple[Document, Optional[Dict[str, Any]]]:
+        """
+        Upload a document using the proper upload flow.
+
+        Args:
+            file_path: Path to the file to upload
+            document_service: Document service instance
+            content: Pre-read file bytes (read lazily if not provided)
+
+        Returns:
+            Tuple[Document, Optional[Dict[str, Any]]]: Created document and
+            its pending title/description update (flushed once per batch)
+        """
+        # Create mock UploadFile
+        mock_file = MockUploadFile(file_path, self.content_type, content)
+
+        # Use the proper upload mechanism
+        document = await document_service.create_document(mock_file)
+
+        # Build a more meaningful title/description, but defer the write —
+        # the whole batch is flushed in a single commit afterwards
+        update = self._pending_update(file_path, document)
+
+        return document, update
+
+    async def bulk_index(self, directory: str, batch_size: int = 5) -> None:
+        """
+        Bulk index all matching files in the directory.
+
+        Args:
+            directory: Directory containing files to index
+            batch_size: Number of files to process in each batch
+        """
+        self.stats['start_time'] = time.time()
+
+        try:
+            # Find all matching files
+            files = self.find_files(directory)
+            self.stats['total_files'] = len(files)
+
+            if not files:
+                print(f"No {self.file_label} found to process.")
+                return
+
+            # Load every indexed filename once and skip with an O(1) set
+            # lookup, instead of an existence query per file
+            existing = self._load_existing_filenames()
+            if existing:
+                before = len(files)
+                files = [f for f in files if f.name not in existing]
+                self.stats['skipped'] = before - len(files)
+                if self.stats['skipped']:
+                    print(f"Skipping {self.stats['skipped']} already-indexed files")
+
+            if not files:
+                print("All files are already indexed.")
+                return
+
+            print(f"Starting bulk indexing of {len(files)} {self.file_label}...")
+            print(f"Processing in batches of {batch_size}")
+
+            # Build the expensive session-free clients once per run — the
+            # Chroma handle and Gemini configuration stay warm across every
+            # batch, while each task still gets its own DB session
+            embedding_service = EmbeddingService()
+            vector_store = VectorStore()
+
+            # Process files in batches
+            for i in range(0, len(files), batch_size):
+                batch = files[i:i + batch_size]
+                batch_num = (i // batch_size) + 1
+                total_batches = (len(files) + batch_size - 1) // batch_size
+
+                print(f"\nProcessing batch {batch_num}/{total_batches} ({len(batch)} files)...")
+                await self._process_batch(batch, embedding_service, vector_store)
+
+        except Exception as e:
+            print(f"Error during bulk indexing: {e}")
+            raise
+        finally:
+            self.stats['end_time'] = time.time()
+            self._print_summary()
+
+    async def _batch_read_files(self, files: List[Path]) -> Dict[Path, bytes]:
+        """
+        Read a batch of files concurrently in worker threads.
+
+        Args:
+            files: List of file paths to read
+
+        Returns:
+            Dict[Path, bytes]: File contents keyed by path (failed reads omitted)
+        """
+        results = await asyncio.gather(
+            *(asyncio.to_thread(p.read_bytes) for p in files),
+            return_exceptions=True
+        )
+        return {
+            path: data
+            for path, data in zip(files, results)
+            if not isinstance(data, BaseException)
+        }
+
+    async def _upload_one(
+        self,
+        file_path: Path,
+        content: bytes
+    ) -> Tuple[int, str, Optional[Dict[str, Any]]]:
+        """
+        Upload a single file using its own database session.
+
+        Args:
+            file_path: Path to the file to upload
+            content: Pre-read file bytes
+
+        Returns:
+            Tuple[int, str, Optional[Dict[str, Any]]]: Document ID, display
+            title, and the pending title/description update
+        """
+        db = next(get_db())
+        try:
+            document_service = DocumentService(db)
+
+            document, update = await self.upload_document(file_path, document_service, content)
+            title = update['title'] if update else document.title
+
+            return document.id, title, update
+        finally:
+            db.close()
+
+    async def _process_batch(
+        self,
+        files: List[Path],
+        embedding_service: EmbeddingService,
+        vector_store: VectorStore
+    ) -> None:
+        """
+        Process a batch of files: concurrent uploads, then one bulk
+        embed-and-index pass over every document in the batch.
+
+        Uploads run as their own tasks with their own sessions (SQLAlchemy
+        sessions are not task-safe), so their I/O waits overlap.
+
+        Args:
+            files: List of file paths to process
+            embedding_service: Shared embedding service for the run
+            vector_store: Shared vector store client for the run
+        """
+        # Pre-read the whole batch off the event loop so uploads start with
+        # their bytes in hand instead of blocking on open/read one at a time
+        contents = await self._batch_read_files(files)
+
+        # Per-file status is buffered and written once per batch — stdout is
+        # lock-per-line under concurrent tasks, and interleaved prints from
+        # the gathered coroutines would scramble anyway
+        lines = []
+
+        # Content-hash dedup over the already-loaded buffers: identical
+        # bytes under a different name (moved or copied files) are skipped
+        # regardless of what the filename prequery matched
+        deduped = []
+        for file_path in files:
+            data = contents.get(file_path)
+            if data is not None:
+                digest = hashlib.sha256(data).digest()
+                if digest in self._seen_hashes:
+                    lines.append(f"  ⏭️  Duplicate content, skipping: {file_path.name}")
+                    self.stats['skipped'] += 1
+                    continue
+                self._seen_hashes.add(digest)
+            deduped.append(file_path)
+        files = deduped
+
+        results = await asyncio.gather(
+            *(self._upload_one(p, contents.get(p)) for p in files),
+            return_exceptions=True
+        )
+        pending_updates = []
+        uploaded = []
+        for file_path, result in zip(files, results):
+            if isinstance(result, BaseException):
+                lines.append(f"  ❌ Error uploading {file_path.name}: {result}")
+                self.stats['failed'] += 1
+                continue
+            document_id, title, update = result
+            if update is not None:
+                pending_updates.append(update)
+            uploaded.append((document_id, title))
+            lines.append(f"  📁 Uploaded: {file_path.name} -> {title}")
+
+        # Flush all title/description updates in one round-trip instead of
+        # a commit + refresh per file
+        if pending_updates:
+            db = next(get_db())
+            try:
+                db.bulk_update_mappings(Document, pending_updates)
+                db.commit()
+            finally:
+                db.close()
+
+        if not uploaded:
+            print("\n".join(lines))
+            return
+
+        # Embed and index the whole batch in one pass — every chunk text
+        # goes to the embedder together instead of document by document.
+        # A worker thread (not a process pool) is deliberate: embeddings
+        # come from the remote Gemini API, so the pipeline waits on the
+        # network with the GIL released; processes would only add pickling
+        # overhead. Revisit if embedding ever moves to a local CPU model.
+        db = next(get_db())
+        try:
+            indexing_service = IndexingService(db, embedding_service, vector_store)
+            outcome = await asyncio.to_thread(
+                indexing_service.process_documents_bulk,
+                [document_id for document_id, _ in uploaded]
+            )
+        finally:
+            db.close()
+
+        for document_id, title in uploaded:
+            if outcome.get(document_id):
+                lines.append(f"  ✅ Successfully processed: {title}")
+                self.stats['processed'] += 1
+            else:
+                lines.append(f"  ❌ Failed to process: {title}")
+                self.stats['failed'] += 1
+
+        print("\n".join(lines))
+
+    def _summary_footer(self) -> None:
+        """Print extra lines after the summary (subclass hook)."""
+        pass
+
+    def _print_summary(self) -> None:
+        """Print indexing summary statistics."""
+        duration = self.stats['end_time'] - self.stats['start_time']
+
+        print("\n" + "="*60)
+        print(self.summary_title)
+        print("="*60)
+        print(f"Total files found:     {self.stats['total_files']}")
+        print(f"Successfully processed: {self.stats['processed']}")
+        print(f"Skipped (existing):    {self.stats['skipped']}")
+        print(f"Failed:                {self.stats['failed']}")
+        print(f"Total duration:        {duration:.2f} seconds")
+
+        if self.stats['total_files'] > 0:
+            avg_time = duration / self.stats['total_files']
+            print(f"Average time per file: {avg_time:.2f} seconds")
+
+        if self.stats['total_files'] > 0:
+            success_rate = (self.stats['processed'] / self.stats['total_files']) * 100
+            print(f"Success rate:          {success_rate:.1f}%")
+
+        print("="*60)
+        self._summary_footer()
@@ -8,264 +8,80 @@ based on their original hierarchy (e.g., "01-app_01-getting-started_01-installat
 
 Features:
 - Simple, fast processing of all files found
-- Batch processing for better performance  
+- Batch processing for better performance
 - Automatic title generation from flattened filenames
-- No duplicate detection (handled at API level)
-
-Note: Duplicate detection should be implemented in the API layer for better control.
+- Duplicate detection via a single filename prequery
 """
 
 import sys
 import os
-import time
+import functools
 from pathlib import Path
-from typing import List, Dict, Any
-from io import BytesIO
 
-# Add the parent directory to the path so we can import from app
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from scripts._bulk_indexer_base import BulkIndexerBase, strip_num_prefix
+except ImportError:
+    # Direct `python scripts/bulk_index_docs_nextjs.py` invocation
+    from _bulk_indexer_base import BulkIndexerBase, strip_num_prefix
 
-from fastapi import UploadFile
-from sqlalchemy.orm import sessionmaker
-from app.config.database import get_db
-from app.services.document_processor import DocumentService
-from app.services.indexing_service import IndexingService
-from app.models.enums import FileType, DocumentStatus
-from app.models.database import Document
 
+@functools.lru_cache(maxsize=4096)
+def _clean_part(part: str) -> str:
+    """
+    Clean one filename segment: strip the number prefix and title-case.
 
-class MockUploadFile:
-    """Mock UploadFile for bulk processing existing files."""
-    
-    def __init__(self, file_path: Path):
-        self.file_path = file_path
-        self.filename = file_path.name
-        self.content_type = "text/markdown"
-        self._content = None
-    
-    async def read(self) -> bytes:
-        """Read file content."""
-        if self._content is None:
-            with open(self.file_path, 'rb') as f:
-                self._content = f.read()
-        return self._content
-    
-    async def seek(self, offset: int):
-        """Seek to position (not used in our case)."""
-        pass
+    Memoized — flattened filenames share ancestor segments (e.g. "01-app"),
+    so the same part is cleaned once per tree instead of once per file.
+    """
+    return strip_num_prefix(part).replace('-', ' ').title()
 
 
-class BulkIndexer:
-    """Bulk document indexing utility."""
-    
-    def __init__(self):
-        """Initialize the bulk indexer."""
-        self.stats = {
-            'total_files': 0,
-            'processed': 0,
-            'failed': 0,
-            'start_time': None,
-            'end_time': None
-        }
-    
-    def find_mdx_files(self, directory: str) -> List[Path]:
-        """
-        Find all MDX files in the given directory recursively.
-        
-        Args:
-            directory: Directory to search
-            
-        Returns:
-            List[Path]: List of MDX file paths
-        """
-        docs_path = Path(directory)
-        if not docs_path.exists():
-            raise FileNotFoundError(f"Directory not found: {directory}")
-        
-        mdx_files = list(docs_path.rglob("*.mdx"))
-        print(f"Found {len(mdx_files)} MDX files in {directory}")
-        return mdx_files
-    
+class BulkIndexer(BulkIndexerBase):
+    """Bulk document indexing utility for NextJS docs."""
+
+    suffix = ".mdx"
+    content_type = "text/markdown"
+    file_label = "MDX files"
+    summary_title = "BULK INDEXING SUMMARY"
+
     def _generate_title_from_path(self, relative_path: Path) -> str:
         """
         Generate a readable title from the file path.
         For flattened files, parse the filename to reconstruct the logical hierarchy.
-        
+
         Args:
             relative_path: Relative path to the file
-            
+
         Returns:
             str: Generated title
         """
         filename = relative_path.stem
-        
+
         # Handle flattened filenames (e.g., "01-app_01-getting-started_01-installation")
         if '_' in filename:
-            # Split on underscores to get path segments
-            parts = filename.split('_')
-            
-            # Clean up numbered prefixes and convert to readable format
-            cleaned_parts = []
-            for part in parts:
-                # Remove number prefixes like "01-", "02-"
-                if '-' in part and part.split('-')[0].isdigit():
-                    part = '-'.join(part.split('-')[1:])
-                cleaned_parts.append(part.replace('-', ' ').title())
-            
-            # Join with " / " to show hierarchy
-            return ' / '.join(cleaned_parts)
+            # Split on underscores, clean each segment, join to show hierarchy
+            return ' / '.join(_clean_part(part) for part in filename.split('_'))
         else:
             # Handle non-flattened files (like index.mdx)
-            if '-' in filename and filename.split('-')[0].isdigit():
-                filename = '-'.join(filename.split('-')[1:])
-            return filename.replace('-', ' ').title()
-    
-    async def upload_document(self, file_path: Path, document_service: DocumentService) -> Document:
-        """
-        Upload a document using the proper upload flow.
-        
-        Args:
-            file_path: Path to the file to upload
-            document_service: Document service instance
-            
-        Returns:
-            Document: Created document
-        """
-        # Create mock UploadFile
-        mock_file = MockUploadFile(file_path)
-        
-        # Use the proper upload mechanism
-        document = await document_service.create_document(mock_file)
-        
-        # Update title and description to be more meaningful
-        try:
-            relative_path = file_path.relative_to(Path("docs_data/nextjs"))
-            title = self._generate_title_from_path(relative_path)
-            document.title = title
-            document.description = f"NextJS documentation: {title}"
-            
-            # Commit the title/description updates
-            document_service.db.commit()
-            document_service.db.refresh(document)
-            
-        except ValueError:
-            # Fallback if relative path doesn't work
-            pass
-        
-        return document
-    
-    async def bulk_index(self, directory: str, batch_size: int = 10) -> None:
-        """
-        Bulk index all MDX files in the directory.
-        
-        Args:
-            directory: Directory containing MDX files
-            batch_size: Number of files to process in each batch
-        """
-        self.stats['start_time'] = time.time()
-        
-        try:
-            # Find all MDX files
-            mdx_files = self.find_mdx_files(directory)
-            self.stats['total_files'] = len(mdx_files)
-            
-            if not mdx_files:
-                print("No MDX files found to process.")
-                return
-            
-            print(f"Starting bulk indexing of {len(mdx_files)} files...")
-            print(f"Processing in batches of {batch_size}")
-            
-            # Process files in batches
-            for i in range(0, len(mdx_files), batch_size):
-                batch = mdx_files[i:i + batch_size]
-                batch_num = (i // batch_size) + 1
-                total_batches = (len(mdx_files) + batch_size - 1) // batch_size
-                
-                print(f"\nProcessing batch {batch_num}/{total_batches} ({len(batch)} files)...")
-                await self._process_batch(batch)
-                
-                # Small delay between batches to avoid overwhelming the system
-                if i + batch_size < len(mdx_files):
-                    time.sleep(1)
-            
-        except Exception as e:
-            print(f"Error during bulk indexing: {e}")
-            raise
-        finally:
-            self.stats['end_time'] = time.time()
-            self._print_summary()
-    
-    async def _process_batch(self, files: List[Path]) -> None:
-        """
-        Process a batch of files.
-        
-        Args:
-            files: List of file paths to process
-        """
-        db = next(get_db())
-        document_service = DocumentService(db)
-        indexing_service = IndexingService(db)
-        
-        try:
-            for file_path in files:
-                try:
-                    print(f"  Processing: {file_path.name}")
-                    
-                    # Step 1: Upload document (proper upload flow)
-                    document = await self.upload_document(file_path, document_service)
-                    print(f"    📁 Uploaded: {document.title}")
-                    
-                    # Step 2: Process the document (extract, embed, index)
-                    success = indexing_service.process_document(document.id)
-                    
-                    if success:
-                        print(f"    ✅ Successfully processed: {document.title}")
-                        self.stats['processed'] += 1
-                    else:
-                        print(f"    ❌ Failed to process: {document.title}")
-                        self.stats['failed'] += 1
-                        
-                except Exception as e:
-                    print(f"    ❌ Error processing {file_path.name}: {e}")
-                    self.stats['failed'] += 1
-                    
-        except Exception as e:
-            print(f"Error in batch processing: {e}")
-            raise
-        finally:
-            db.close()
-    
-    def _print_summary(self) -> None:
-        """Print indexing summary statistics."""
-        duration = self.stats['end_time'] - self.stats['start_time']
-        
-        print("\n" + "="*60)
-        print("BULK INDEXING SUMMARY")
-        print("="*60)
-        print(f"Total files found:     {self.stats['total_files']}")
-        print(f"Successfully processed: {self.stats['processed']}")
-        print(f"Failed:                {self.stats['failed']}")
-        print(f"Total duration:        {duration:.2f} seconds")
-        
-        if self.stats['total_files'] > 0:
-            avg_time = duration / self.stats['total_files']
-            print(f"Average time per file: {avg_time:.2f} seconds")
-        
-        if self.stats['total_files'] > 0:
-            success_rate = (self.stats['processed'] / self.stats['total_files']) * 100
-            print(f"Success rate:          {success_rate:.1f}%")
-        
-        print("="*60)
+            return _clean_part(filename)
+
+    def title_for(self, file_path: Path) -> str:
+        """Generate the display title from the docs-relative path."""
+        relative_path = file_path.relative_to(Path("docs_data/nextjs"))
+        return self._generate_title_from_path(relative_path)
+
+    def description_for(self, title: str) -> str:
+        """Generate the document description for a title."""
+        return f"NextJS documentation: {title}"
 
 
 async def main():
     """Main function to run bulk indexing."""
     import argparse
-    
+
     parser = argparse.ArgumentParser(description="Bulk index NextJS documentation")
     parser.add_argument(
-        "--directory", 
+        "--directory",
         default="docs_data/nextjs",
         help="Directory containing MDX files (default: docs_data/nextjs)"
     )
@@ -276,20 +92,20 @@ async def main():
         help="Number of files to process in each batch (default: 5)"
     )
 
-    
+
     args = parser.parse_args()
-    
+
     # Validate directory exists
     if not os.path.exists(args.directory):
         print(f"Error: Directory '{args.directory}' does not exist.")
         sys.exit(1)
-    
+
     # Initialize and run bulk indexer
     try:
         indexer = BulkIndexer()
-        
+
         await indexer.bulk_index(args.directory, args.batch_size)
-        
+
     except KeyboardInterrupt:
         print("\nIndexing interrupted by user.")
         sys.exit(1)
@@ -300,4 +116,4 @@ async def main():
 
 if __name__ == "__main__":
     import asyncio
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main())
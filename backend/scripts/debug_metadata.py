@@ -31,38 +31,39 @@ def inspect_metadata():
             print("❌ No documents in collection!")
             return
         
-        # Query a few random documents to inspect metadata
-        print("\n🧐 Inspecting sample documents...")
+        # Query a sample document to inspect metadata
+        print("\n🧐 Inspecting sample document...")
         print("-" * 40)
-        
-        # Use vector store to get some sample documents
-        # We'll do a dummy search to get some results
+
+        # Use vector store to get a sample document
         try:
             # Try to get raw data from ChromaDB
             collection = vector_store.collection
-            
-            # Get first 5 documents with their metadata
+
+            # One document is enough for the diagnosis below; fetching more
+            # just streams extra chunk text out of the collection
             results = collection.get(
-                limit=5,
+                limit=1,
                 include=["documents", "metadatas"]
             )
-            
+
             if results['documents']:
-                for i, (doc, metadata) in enumerate(zip(results['documents'], results['metadatas'])):
-                    print(f"\n📄 Document {i+1}:")
-                    print(f"   Content preview: {doc[:100]}...")
-                    print(f"   Metadata keys: {list(metadata.keys()) if metadata else 'None'}")
-                    
-                    if metadata:
-                        print(f"   document_id: {metadata.get('document_id', 'MISSING')}")
-                        print(f"   file_name: {metadata.get('file_name', 'MISSING')}")
-                        print(f"   file_type: {metadata.get('file_type', 'MISSING')}")
-                        print(f"   chunk_index: {metadata.get('chunk_index', 'MISSING')}")
-                    else:
-                        print("   ❌ No metadata found!")
+                doc = results['documents'][0]
+                metadata = results['metadatas'][0]
+                print(f"\n📄 Document 1:")
+                print(f"   Content preview: {doc[:100]}...")
+                print(f"   Metadata keys: {list(metadata.keys()) if metadata else 'None'}")
+
+                if metadata:
+                    print(f"   document_id: {metadata.get('document_id', 'MISSING')}")
+                    print(f"   file_name: {metadata.get('file_name', 'MISSING')}")
+                    print(f"   file_type: {metadata.get('file_type', 'MISSING')}")
+                    print(f"   chunk_index: {metadata.get('chunk_index', 'MISSING')}")
+                else:
+                    print("   ❌ No metadata found!")
             else:
                 print("❌ No documents found in results!")
-                
+
         except Exception as e:
             print(f"❌ Error inspecting documents: {e}")
         
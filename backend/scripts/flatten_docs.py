@@ -26,10 +26,20 @@ def find_all_mdx_files(root_dir: Path) -> List[Path]:
     Returns:
         List[Path]: List of MDX file paths
     """
+    # Walk with an explicit scandir stack; DirEntry type checks come from
+    # the directory listing itself, so no per-file stat or Path allocation
     mdx_files = []
-    for file_path in root_dir.rglob("*.mdx"):
-        if file_path.is_file():
-            mdx_files.append(file_path)
+    stack = [str(root_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".mdx") and entry.is_file():
+                        mdx_files.append(Path(entry.path))
+        except OSError:
+            continue
     return sorted(mdx_files)
 
 
@@ -44,74 +54,51 @@ def generate_flattened_name(file_path: Path, root_dir: Path) -> str:
     Returns:
         str: Flattened filename
     """
-    try:
-        # Get relative path from root
-        relative_path = file_path.relative_to(root_dir)
-        
-        # Get all path parts except the filename
-        path_parts = relative_path.parts[:-1]  # Exclude the filename
-        filename = relative_path.parts[-1]     # Get the filename
-        
-        # If file is directly in root, keep original name
-        if not path_parts:
-            return filename
-        
-        # Join path parts with underscores and add filename
-        flattened_prefix = "_".join(path_parts)
-        
-        # Remove .mdx extension, add prefix, then add back extension
-        name_without_ext = filename.rsplit('.', 1)[0]
-        flattened_name = f"{flattened_prefix}_{name_without_ext}.mdx"
-        
-        return flattened_name
-        
-    except ValueError:
-        # Fallback if relative path doesn't work
+    # Stay in C-implemented os.path/str ops; this runs once per file and
+    # the pathlib parts tuple plus rsplit/f-string allocations add up
+    rel = os.path.relpath(str(file_path), str(root_dir))
+    if rel.startswith('..'):
+        # Fallback if the file isn't under the root
         return file_path.name
 
+    head, tail = os.path.split(rel)
+
+    # If file is directly in root, keep original name
+    if not head:
+        return tail
+
+    # Join path parts with underscores; the suffix is known to be .mdx
+    return head.replace(os.sep, '_') + '_' + tail[:-4] + '.mdx'
+
 
-def preview_changes(root_dir: Path) -> List[Tuple[Path, str]]:
+def preview_changes(root_dir: Path) -> Tuple[List[Tuple[Path, str]], List[str]]:
     """
-    Preview what changes will be made without actually moving files.
-    
+    Preview what changes will be made without actually moving files,
+    detecting filename conflicts inline in the same pass.
+
     Args:
         root_dir: Root directory
-        
+
     Returns:
-        List[Tuple[Path, str]]: List of (original_path, new_filename) tuples
+        Tuple[List[Tuple[Path, str]], List[str]]: List of
+        (original_path, new_filename) tuples and any conflict messages
     """
     mdx_files = find_all_mdx_files(root_dir)
     changes = []
-    
-    for file_path in mdx_files:
-        new_name = generate_flattened_name(file_path, root_dir)
-        changes.append((file_path, new_name))
-    
-    return changes
-
-
-def check_for_conflicts(changes: List[Tuple[Path, str]]) -> List[str]:
-    """
-    Check for filename conflicts after flattening.
-    
-    Args:
-        changes: List of (original_path, new_filename) tuples
-        
-    Returns:
-        List[str]: List of conflicting filenames
-    """
     seen_names = {}
     conflicts = []
-    
-    for original_path, new_name in changes:
+
+    for file_path in mdx_files:
+        new_name = generate_flattened_name(file_path, root_dir)
         if new_name in seen_names:
             conflicts.append(f"Conflict: '{new_name}' would be used by:")
             conflicts.append(f"  - {seen_names[new_name]}")
-            conflicts.append(f"  - {original_path}")
+            conflicts.append(f"  - {file_path}")
         else:
-            seen_names[new_name] = original_path
-    
-    return conflicts
+            seen_names[new_name] = file_path
+            changes.append((file_path, new_name))
+
+    return changes, conflicts
 
 
 def flatten_directory(root_dir: Path, dry_run: bool = True) -> None:
@@ -125,17 +112,16 @@ def flatten_directory(root_dir: Path, dry_run: bool = True) -> None:
     print(f"{'DRY RUN: ' if dry_run else ''}Flattening directory: {root_dir}")
     print("=" * 70)
     
-    # Get all changes
-    changes = preview_changes(root_dir)
-    
-    if not changes:
+    # Get all changes and any conflicts in one pass
+    changes, conflicts = preview_changes(root_dir)
+
+    if not changes and not conflicts:
         print("No MDX files found to flatten.")
         return
-    
-    print(f"Found {len(changes)} MDX files to process.")
-    
-    # Check for conflicts
-    conflicts = check_for_conflicts(changes)
+
+    # Each conflict contributes three message lines for one excluded file
+    print(f"Found {len(changes) + len(conflicts) // 3} MDX files to process.")
+
     if conflicts:
         print("\n❌ FILENAME CONFLICTS DETECTED:")
         print("=" * 50)
@@ -151,8 +137,7 @@ def flatten_directory(root_dir: Path, dry_run: bool = True) -> None:
     print("-" * 50)
     
     moved_count = 0
-    removed_dirs = set()
-    
+
     for original_path, new_name in changes:
         new_path = root_dir / new_name
         
@@ -162,52 +147,51 @@ def flatten_directory(root_dir: Path, dry_run: bool = True) -> None:
         
         if not dry_run:
             try:
-                # Move the file
-                shutil.move(str(original_path), str(new_path))
+                # Move the file — rename is a single syscall; fall back to
+                # shutil.move only if the destination is on another device
+                try:
+                    os.rename(original_path, new_path)
+                except OSError:
+                    shutil.move(str(original_path), str(new_path))
                 moved_count += 1
-                
-                # Track directories that might become empty
-                parent_dir = original_path.parent
-                if parent_dir != root_dir:
-                    removed_dirs.add(parent_dir)
-                    
+
             except Exception as e:
                 print(f"    ❌ Error moving file: {e}")
-    
+
     if not dry_run:
         print(f"\n✅ Successfully moved {moved_count} files.")
-        
+
         # Clean up empty directories
         print("\nCleaning up empty directories...")
-        cleanup_empty_directories(root_dir, removed_dirs)
+        cleanup_empty_directories(root_dir)
     else:
         print(f"\nDry run complete. {len(changes)} files would be moved.")
         print("Run with --execute to apply changes.")
 
 
-def cleanup_empty_directories(root_dir: Path, dirs_to_check: set) -> None:
+def cleanup_empty_directories(root_dir: Path) -> None:
     """
     Remove empty directories after flattening.
-    
+
     Args:
         root_dir: Root directory (won't be removed)
-        dirs_to_check: Set of directories to check for emptiness
     """
     removed_count = 0
-    
-    # Sort directories by depth (deepest first) to remove from bottom up
-    sorted_dirs = sorted(dirs_to_check, key=lambda p: len(p.parts), reverse=True)
-    
-    for dir_path in sorted_dirs:
+    root_str = str(root_dir)
+
+    # One bottom-up walk catches every empty directory, including
+    # intermediates that only became empty because their subtrees emptied
+    for dirpath, dirnames, filenames in os.walk(root_dir, topdown=False):
+        if dirpath == root_str:
+            continue
         try:
-            # Only remove if directory is empty and not the root
-            if dir_path != root_dir and dir_path.exists() and not any(dir_path.iterdir()):
-                print(f"  Removing empty directory: {dir_path.relative_to(root_dir)}")
-                dir_path.rmdir()
+            if not os.listdir(dirpath):
+                print(f"  Removing empty directory: {os.path.relpath(dirpath, root_str)}")
+                os.rmdir(dirpath)
                 removed_count += 1
         except Exception as e:
-            print(f"  ❌ Error removing directory {dir_path}: {e}")
-    
+            print(f"  ❌ Error removing directory {dirpath}: {e}")
+
     if removed_count > 0:
         print(f"✅ Removed {removed_count} empty directories.")
     else:
@@ -6,9 +6,16 @@ List and manage DocuRAG database backups.
 import sys
 import os
 import json
+import functools
 from datetime import datetime
 from pathlib import Path
 
+try:
+    # ~3-5x faster JSON decode; matters when iterating many backups
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add the parent directory to the path so we can import from app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -43,6 +50,51 @@ def format_time(timestamp: float) -> str:
         return f"just now ({dt.strftime('%H:%M')})"
 
 
+_ARCHIVE_SUFFIXES = (".zip", ".tar.gz", ".tgz")
+
+
+def _archive_name(filename: str):
+    """Backup name for an archive filename, or None if not an archive."""
+    for suffix in _ARCHIVE_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return None
+
+
+def _dir_size(path: Path) -> int:
+    """Total size of all files under a directory, via a scandir stack."""
+    total = 0
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+@functools.lru_cache(maxsize=128)
+def _dir_size_cached(path_str: str, mtime_ns: int) -> int:
+    """Memoized directory size; the mtime key invalidates on changes."""
+    return _dir_size(Path(path_str))
+
+
+@functools.lru_cache(maxsize=128)
+def _load_stats_cached(stats_path: str, mtime: float) -> dict:
+    """Parse a stats file; keyed on mtime so edits invalidate the cache."""
+    try:
+        with open(stats_path, 'rb') as f:
+            data = f.read()
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+    except Exception:
+        return {}
+
+
 def load_backup_stats(backup_path: Path) -> dict:
     """Load backup statistics if available."""
     if backup_path.is_dir():
@@ -50,15 +102,14 @@ def load_backup_stats(backup_path: Path) -> dict:
     else:
         # For zip files, we can't easily read the stats without extracting
         return {}
-    
-    if stats_file.exists():
-        try:
-            with open(stats_file, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    
-    return {}
+
+    try:
+        mtime = stats_file.stat().st_mtime
+    except OSError:
+        return {}
+
+    # Unchanged manifests are parsed once per process, not once per listing
+    return _load_stats_cached(str(stats_file), mtime)
 
 
 def list_backups(detailed: bool = False):
@@ -71,19 +122,22 @@ def list_backups(detailed: bool = False):
     
     backups = []
     
-    # Look for both directories and zip files
+    # Look for both directories and archive files
     for item in backup_base.iterdir():
+        archive_name = _archive_name(item.name)
         if item.is_dir():
-            size = sum(f.stat().st_size for f in item.rglob('*') if f.is_file())
+            # Deferred until the row is printed; multi-GB backup dirs make
+            # eager sizing the dominant cost of building the listing
+            size = None
             backup_type = "directory"
-        elif item.suffix == ".zip":
+        elif archive_name is not None:
             size = item.stat().st_size
             backup_type = "archive"
         else:
             continue
         
         backup_info = {
-            "name": item.stem if item.suffix == ".zip" else item.name,
+            "name": archive_name if backup_type == "archive" else item.name,
             "path": item,
             "type": backup_type,
             "size": size,
@@ -105,7 +159,12 @@ def list_backups(detailed: bool = False):
     
     for i, backup in enumerate(backups, 1):
         stats = backup["stats"]
-        
+
+        if backup["size"] is None:
+            backup["size"] = _dir_size_cached(
+                str(backup["path"]), int(backup["modified"] * 1e9)
+            )
+
         print(f"{i:2d}. {backup['name']}")
         print(f"    Type: {backup['type']} | Size: {format_size(backup['size'])}")
         print(f"    Created: {format_time(backup['modified'])}")
@@ -130,8 +189,8 @@ def delete_backup(backup_name: str, force: bool = False):
     backup_base = Path("backups")
     backup_found = False
     
-    # Look for both directory and zip file
-    for suffix in ["", ".zip"]:
+    # Look for both directory and archive forms
+    for suffix in ("",) + _ARCHIVE_SUFFIXES:
         backup_path = backup_base / f"{backup_name}{suffix}"
         if backup_path.exists():
             backup_found = True
@@ -175,10 +234,11 @@ def cleanup_old_backups(keep_count: int = 5, keep_days: int = 30):
     
     # Collect all backups
     for item in backup_base.iterdir():
-        if item.is_dir() or item.suffix == ".zip":
+        archive_name = _archive_name(item.name)
+        if item.is_dir() or archive_name is not None:
             backups.append({
                 "path": item,
-                "name": item.stem if item.suffix == ".zip" else item.name,
+                "name": archive_name or item.name,
                 "modified": item.stat().st_mtime,
                 "age_days": (current_time - item.stat().st_mtime) / (24 * 3600)
             })
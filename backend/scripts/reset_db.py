@@ -7,6 +7,7 @@ Clears all data and resets the database to a clean state.
 import sys
 import os
 import shutil
+import threading
 from pathlib import Path
 
 # Add the parent directory to the path so we can import from app
@@ -79,10 +80,21 @@ def reset_uploaded_files():
         upload_dir = Path(settings.UPLOAD_DIR)
         
         if upload_dir.exists():
-            # Remove the entire upload directory
-            shutil.rmtree(upload_dir)
+            # Rename the directory aside (one syscall) and delete it in a
+            # background thread; rmtree walks every entry in Python and can
+            # take seconds on a large upload dir, which would block reset.
+            # Non-daemon so the interpreter joins it at exit — a daemon
+            # thread would be killed when this short-lived script finishes,
+            # stranding the renamed tree on disk
+            trash_dir = upload_dir.with_name(f"{upload_dir.name}.trash.{os.getpid()}")
+            os.rename(upload_dir, trash_dir)
+            threading.Thread(
+                target=shutil.rmtree,
+                args=(trash_dir,),
+                kwargs={"ignore_errors": True},
+            ).start()
             print(f"  ✅ Removed upload directory: {upload_dir}")
-            
+
         # Recreate the upload directory
         upload_dir.mkdir(parents=True, exist_ok=True)
         print(f"  ✅ Recreated upload directory: {upload_dir}")
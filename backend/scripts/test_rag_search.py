@@ -7,12 +7,34 @@ Demonstrates how to use the search service to query documents.
 import sys
 import os
 import asyncio
+import functools
 
 # Add the parent directory to the path so we can import from app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.config.database import SessionLocal
 from app.services.search_service import RAGSearchService
+from app.services.embedding_service import EmbeddingService
+from app.services.vector_store import VectorStore
+
+
+# Shared across the test functions so each RAGSearchService doesn't redo
+# the Gemini client handshake and ChromaDB bootstrap
+@functools.cache
+def _embedder() -> EmbeddingService:
+    return EmbeddingService()
+
+
+@functools.cache
+def _vector_store() -> VectorStore:
+    return VectorStore()
+
+
+def _search_service(db) -> RAGSearchService:
+    """Build a search service on the shared embedding/vector store clients."""
+    return RAGSearchService(
+        db, embedding_service=_embedder(), vector_store=_vector_store()
+    )
 
 
 def test_rag_search():
@@ -26,7 +48,7 @@ def test_rag_search():
     
     try:
         # Initialize search service
-        search_service = RAGSearchService(db)
+        search_service = _search_service(db)
         
         # Test queries
         test_queries = [
@@ -36,29 +58,36 @@ def test_rag_search():
             "What are the benefits of using the App Router?",
             "How to deploy a Next.js application?"
         ]
-        
-        for i, query in enumerate(test_queries, 1):
+
+        # Each query is dominated by network round-trips to the embedding
+        # API, vector store and LLM, so run them all concurrently and let
+        # the wall time approach the slowest query instead of the sum
+        async def _run_all():
+            return await asyncio.gather(
+                *(
+                    search_service.asearch(query=q, k=3, min_similarity=0.1)
+                    for q in test_queries
+                ),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(_run_all())
+
+        for i, (query, result) in enumerate(zip(test_queries, results), 1):
             print(f"\n{i}. Testing Query: '{query}'")
             print("-" * 40)
-            
-            try:
-                # Perform RAG search
-                result = search_service.search(
-                    query=query,
-                    k=3,  # Retrieve top 3 chunks
-                    min_similarity=0.1
-                )
-                
-                print(f"📊 Found {result['total_chunks']} relevant chunks")
-                print(f"💬 Answer: {result['answer'][:200]}...")
-                
-                if result['sources']:
-                    print(f"📚 Sources:")
-                    for idx, source in enumerate(result['sources'][:2], 1):
-                        print(f"   {idx}. {source['file_name']} (similarity: {source['similarity_score']:.3f})")
-                
-            except Exception as e:
-                print(f"❌ Error: {str(e)}")
+
+            if isinstance(result, Exception):
+                print(f"❌ Error: {str(result)}")
+                continue
+
+            print(f"📊 Found {result['total_chunks']} relevant chunks")
+            print(f"💬 Answer: {result['answer'][:200]}...")
+
+            if result['sources']:
+                print(f"📚 Sources:")
+                for idx, source in enumerate(result['sources'][:2], 1):
+                    print(f"   {idx}. {source['file_name']} (similarity: {source['similarity_score']:.3f})")
         
         print("\n" + "=" * 50)
         print("✅ RAG Search test completed!")
@@ -81,7 +110,7 @@ def test_similarity_search():
     
     try:
         # Initialize search service
-        search_service = RAGSearchService(db)
+        search_service = _search_service(db)
         
         query = "Next.js routing"
         
@@ -122,7 +151,7 @@ def test_vector_store_connection():
     db = SessionLocal()
     
     try:
-        search_service = RAGSearchService(db)
+        search_service = _search_service(db)
         vector_store = search_service.vector_store
         
         # Get collection info